@@ -24,6 +24,10 @@ class ClientContext:
     """
     Basic context manager for a ClientBuilder connection.
     """
+    __slots__ = ("dashboard_url", "python_version", "ray_version",
+                 "ray_commit", "protocol_version", "_num_clients",
+                 "_context_to_restore")
+
     dashboard_url: Optional[str]
     python_version: str
     ray_version: str
@@ -141,8 +145,12 @@ class ClientBuilder:
             job_config=self._job_config,
             _credentials=self._credentials,
             ray_init_kwargs=self._remote_init_kwargs)
-        dashboard_url = ray.get(
-            ray.remote(ray.worker.get_dashboard_url).remote())
+        dashboard_url = client_info_dict["dashboard_url"]
+        if not dashboard_url:
+            # Older servers don't report the dashboard URL, so ask the
+            # cluster for it.
+            dashboard_url = ray.get(
+                ray.remote(ray.worker.get_dashboard_url).remote())
         cxt = ClientContext(
             dashboard_url=dashboard_url,
             python_version=client_info_dict["python_version"],
@@ -107,6 +107,10 @@ class JobConfig:
         self.runtime_env["uris"] = uris
         self._parsed_runtime_env.set_uris(uris)
 
+    def get_parsed_runtime_env(self) -> Dict[str, Any]:
+        """Return the parsed runtime env dict without a JSON round trip"""
+        return self._parsed_runtime_env.get_parsed_dict()
+
     def get_serialized_runtime_env(self) -> str:
         """Return the JSON-serialized parsed runtime env dict"""
         return self._parsed_runtime_env.serialize()
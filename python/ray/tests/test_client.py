@@ -7,9 +7,12 @@ import queue
 import threading
 import _thread
 
+import grpc
+
 import ray.util.client.server.server as ray_client_server
 from ray.tests.client_test_utils import create_remote_signal_actor
 from ray.util.client.common import ClientObjectRef
+import ray.util.client.worker as client_worker
 from ray.util.client.ray_client_helpers import connect_to_client_or_not
 from ray.util.client.ray_client_helpers import ray_start_client_server
 from ray._private.client_mode_hook import client_mode_should_convert
@@ -555,6 +558,27 @@ def test_internal_kv(ray_start_regular_shared):
         assert ray._internal_kv_get("apple") == b""
 
 
+def test_client_api_method_cache(ray_start_regular_shared, monkeypatch):
+    with ray_start_client_server() as ray:
+        cxt = ray.get_context()
+        # Client API methods are resolved once and then served from the cache.
+        assert ray.put is ray.put
+        assert "put" in cxt._api_methods
+        assert ray._internal_kv_initialized()
+
+        # If the channel drops without an explicit disconnect, the cached
+        # methods are no longer served.
+        monkeypatch.setattr(cxt.client_worker, "is_connected", lambda: False)
+        assert not ray._internal_kv_initialized()
+        assert not ray.is_initialized()
+        with pytest.raises(Exception, match="Ray Client is not connected"):
+            ray.put(1)
+
+        monkeypatch.undo()
+        assert ray.get(ray.put(1)) == 1
+    assert cxt._api_methods == {}
+
+
 def test_startup_retry(ray_start_regular_shared):
     from ray.util.client import ray as ray_client
     ray_client._inside_client_test = True
@@ -602,6 +626,104 @@ def test_dataclient_server_drop(ray_start_regular_shared):
     time.sleep(3)
 
 
+class _MockChannel:
+    def __init__(self, closed):
+        self._closed = closed
+
+    def subscribe(self, callback):
+        pass
+
+    def unsubscribe(self, callback):
+        pass
+
+    def close(self):
+        self._closed.append(self)
+
+
+@pytest.fixture
+def mock_insecure_channel(monkeypatch):
+    """Replace grpc.insecure_channel with mock channels.
+
+    Returns the list that the mock channels append themselves to when
+    closed.
+    """
+    closed = []
+
+    def insecure_channel(conn_str, options=None, compression=None):
+        return _MockChannel(closed)
+
+    monkeypatch.setattr(grpc, "insecure_channel", insecure_channel)
+    return closed
+
+
+def test_client_channel_cache(mock_insecure_channel):
+    closed = mock_insecure_channel
+
+    key1, channel1 = client_worker._acquire_channel("localhost:1", False, None)
+    key2, channel2 = client_worker._acquire_channel("localhost:1", False, None)
+    key3, channel3 = client_worker._acquire_channel("localhost:2", False, None)
+    assert channel1 is channel2
+    assert channel1 is not channel3
+
+    # The channel is only closed once its last user releases it.
+    client_worker._release_channel(key1)
+    assert closed == []
+    client_worker._release_channel(key2)
+    assert closed == [channel1]
+    client_worker._release_channel(key3)
+    assert closed == [channel1, channel3]
+
+
+def test_client_workers_share_channel(monkeypatch, mock_insecure_channel):
+    closed = mock_insecure_channel
+
+    class MockFuture:
+        def result(self, timeout=None):
+            pass
+
+    class MockStream:
+        def __init__(self, *args):
+            pass
+
+        def set_logstream_level(self, level):
+            pass
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(grpc, "channel_ready_future",
+                        lambda channel: MockFuture())
+    monkeypatch.setattr(client_worker.ray_client_pb2_grpc, "RayletDriverStub",
+                        lambda channel: None)
+    monkeypatch.setattr(client_worker, "DataClient", MockStream)
+    monkeypatch.setattr(client_worker, "LogstreamClient", MockStream)
+    monkeypatch.setattr(client_worker.Worker, "ping_server", lambda self: True)
+
+    worker1 = client_worker.Worker("localhost:1")
+    worker2 = client_worker.Worker("localhost:1")
+    channel = worker1.channel
+    assert worker2.channel is channel
+    worker1.close()
+    assert closed == []
+    worker2.close()
+    assert closed == [channel]
+
+    # A failed connect releases its reference to the shared channel.
+    worker3 = client_worker.Worker("localhost:1")
+
+    def failing_ping_server(self):
+        raise ValueError("ping failed")
+
+    monkeypatch.setattr(client_worker.Worker, "ping_server",
+                        failing_ping_server)
+    with pytest.raises(ValueError):
+        client_worker.Worker("localhost:1")
+    assert len(closed) == 1
+    worker3.close()
+    assert len(closed) == 2
+    assert ("localhost:1", False, None) not in client_worker._channel_cache
+
+
 @pytest.mark.skipif(sys.platform == "win32", reason="Failing on Windows.")
 def test_client_gpu_ids(call_ray_stop_only):
     import ray
@@ -5,7 +5,9 @@ import sys
 from unittest.mock import patch, Mock
 
 import ray
+import ray.util.client.server.dataservicer as ray_client_dataservicer
 import ray.util.client.server.server as ray_client_server
+import ray.util.client.worker as client_worker
 import ray.client_builder as client_builder
 from ray._private.test_utils import run_string_as_driver_nonblocking,\
     wait_for_condition, run_string_as_driver
@@ -109,6 +111,41 @@ def test_connect_to_cluster(ray_start_regular_shared):
     subprocess.check_output("ray stop --force", shell=True)
 
 
+def test_connect_dashboard_url(ray_start_regular, monkeypatch):
+    dashboard_url = ray.worker.get_dashboard_url()
+    assert dashboard_url
+    remote_calls = []
+    original_call_remote = client_worker.Worker.call_remote
+
+    def counting_call_remote(self, instance, *args, **kwargs):
+        remote_calls.append(instance)
+        return original_call_remote(self, instance, *args, **kwargs)
+
+    monkeypatch.setattr(client_worker.Worker, "call_remote",
+                        counting_call_remote)
+    server = ray_client_server.serve("localhost:50055")
+    try:
+        # The server reports the dashboard URL with the connection info, so
+        # no task is needed to look it up.
+        client_info = ray.util.client_connect.connect("localhost:50055")
+        assert client_info["dashboard_url"] == dashboard_url
+        ray.util.client_connect.disconnect()
+
+        with ray.client("localhost:50055").connect() as client_context:
+            assert client_context.dashboard_url == dashboard_url
+        assert remote_calls == []
+
+        # Older servers report an empty URL, in which case it is looked up
+        # with a task.
+        monkeypatch.setattr(ray_client_dataservicer, "_get_dashboard_url",
+                            lambda: "")
+        with ray.client("localhost:50055").connect() as client_context:
+            assert client_context.dashboard_url == dashboard_url
+        assert len(remote_calls) == 1
+    finally:
+        server.stop(0)
+
+
 @pytest.mark.skipif(sys.platform == "win32", reason="Flaky on Windows.")
 def test_local_clusters():
     """
@@ -10,7 +10,9 @@ from unittest.mock import patch
 import ray.util.client.server.server as ray_client_server
 import ray.core.generated.ray_client_pb2 as ray_client_pb2
 
-from ray.util.client import _ClientContext, CURRENT_PROTOCOL_VERSION
+from ray.util.client import (_ClientContext, CURRENT_PROTOCOL_VERSION,
+                             _compatible_versions)
+from ray.util.client.dataclient import DataClient
 
 import ray
 
@@ -151,6 +153,9 @@ def test_python_version(init_and_serve):
     info1 = ray.connect("localhost:50051")
     assert info1["python_version"] == ".".join(
         [str(x) for x in list(sys.version_info)[:3]])
+    # Compatible versions are remembered for later connects.
+    assert (info1["python_version"],
+            info1["protocol_version"]) in _compatible_versions
     ray.disconnect()
     time.sleep(1)
 
@@ -176,6 +181,12 @@ def test_python_version(init_and_serve):
     assert info3["num_clients"] == 1, info3
     ray.disconnect()
 
+    # Mismatched versions are never remembered, so they are checked again.
+    assert ("2.7.12", CURRENT_PROTOCOL_VERSION) not in _compatible_versions
+    ray = _ClientContext()
+    with pytest.raises(RuntimeError):
+        _ = ray.connect("localhost:50051")
+
 
 def test_protocol_version(init_and_serve):
     server_handle = init_and_serve
@@ -183,6 +194,8 @@ def test_protocol_version(init_and_serve):
     info1 = ray.connect("localhost:50051")
     local_py_version = ".".join([str(x) for x in list(sys.version_info)[:3]])
     assert info1["protocol_version"] == CURRENT_PROTOCOL_VERSION, info1
+    # Compatible versions are remembered for later connects.
+    assert (local_py_version, CURRENT_PROTOCOL_VERSION) in _compatible_versions
     ray.disconnect()
     time.sleep(1)
 
@@ -208,6 +221,69 @@ def test_protocol_version(init_and_serve):
     assert info3["num_clients"] == 1, info3
     ray.disconnect()
 
+    # Mismatched versions are never remembered, so they are checked again.
+    assert (local_py_version, "2050-01-01") not in _compatible_versions
+    ray = _ClientContext()
+    with pytest.raises(RuntimeError):
+        _ = ray.connect("localhost:50051")
+
+
+def test_connection_info_in_init_response(init_and_serve, monkeypatch):
+    server_handle = init_and_serve
+    connection_info_requests = []
+    original_connection_info = DataClient.ConnectionInfo
+
+    def counting_connection_info(self, context=None):
+        connection_info_requests.append(None)
+        return original_connection_info(self, context)
+
+    monkeypatch.setattr(DataClient, "ConnectionInfo", counting_connection_info)
+
+    # The connection info comes back with the init response.
+    ray = _ClientContext()
+    info1 = ray.connect("localhost:50051")
+    assert info1["protocol_version"] == CURRENT_PROTOCOL_VERSION, info1
+    assert connection_info_requests == []
+    ray.disconnect()
+    time.sleep(1)
+
+    # Older servers don't attach it, so the client requests it separately.
+    original_init = DataClient.Init
+
+    def init_without_connection_info(self, request, context=None):
+        response = original_init(self, request, context)
+        response.ClearField("connection_info")
+        return response
+
+    monkeypatch.setattr(DataClient, "Init", init_without_connection_info)
+
+    ray = _ClientContext()
+    info2 = ray.connect("localhost:50051")
+    assert len(connection_info_requests) == 1
+    assert set(info2) == set(info1), info2
+    assert info2["python_version"] == info1["python_version"], info2
+    assert info2["protocol_version"] == CURRENT_PROTOCOL_VERSION, info2
+    ray.disconnect()
+    time.sleep(1)
+
+    # The version check still runs on the separately requested info.
+    def mock_connection_response():
+        return ray_client_pb2.ConnectionInfoResponse(
+            num_clients=1,
+            python_version="2.7.12",
+            ray_version="",
+            ray_commit="",
+            protocol_version=CURRENT_PROTOCOL_VERSION,
+        )
+
+    server_handle.data_servicer._build_connection_response = \
+        mock_connection_response
+
+    ray = _ClientContext()
+    with pytest.raises(RuntimeError):
+        _ = ray.connect("localhost:50051")
+    assert len(connection_info_requests) == 2
+
 
 @patch("ray.util.client.server.dataservicer.CLIENT_SERVER_MAX_THREADS", 6)
 @patch("ray.util.client.server.logservicer.CLIENT_SERVER_MAX_THREADS", 6)
@@ -216,9 +292,12 @@ def test_max_clients(init_and_serve):
     def get_job_id(api):
         return api.get_runtime_context().worker.current_job_id
 
+    # Keep the clients alive, since dropped contexts close their connection.
+    apis = []
     for i in range(3):
         api1 = _ClientContext()
         info1 = api1.connect("localhost:50051")
+        apis.append(api1)
 
         assert info1["num_clients"] == i + 1, info1
 
@@ -1,6 +1,10 @@
+import asyncio
+import gc
 import sys
 import pytest
 import ray
+from ray.util.client import (ray as ray_stub, _ClientContext,
+                             _get_default_context)
 
 
 @pytest.mark.skipif(
@@ -184,5 +188,80 @@ def test_multi_cli_threading(call_ray_start):
     assert ret == [0, 1]
 
 
+@pytest.mark.skipif(
+    sys.platform == "win32",
+    reason="PSUtil does not work the same on windows.")
+@pytest.mark.parametrize(
+    "call_ray_start",
+    ["ray start --head --ray-client-server-port 25001 --port 0"],
+    indirect=True)
+def test_multi_cli_dropped_context(call_ray_start):
+    cli1 = ray.init("ray://localhost:25001", allow_multiple=True)
+    cli2 = ray.init("ray://localhost:25001", allow_multiple=True)
+    assert ray.util.client.num_connected_contexts() == 2
+
+    # Dropping a client without disconnecting closes its connection and
+    # unregisters it.
+    worker = cli2._context_to_restore.client_worker
+    del cli2
+    gc.collect()
+    assert worker.closed
+    assert ray.util.client.num_connected_contexts() == 1
+
+    with cli1:
+        assert 10 == ray.get(ray.put(10))
+    cli1.disconnect()
+    assert ray.util.client.num_connected_contexts() == 0
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 7),
+    reason="asyncio tasks only get their own contextvars from Python 3.7.")
+def test_multi_cli_context_isolation():
+    import threading
+    default_cxt = _get_default_context()
+    ray_stub.set_context(default_cxt)
+    seen = {}
+
+    async def switch():
+        ray_stub.set_context(_ClientContext())
+        # Let the sibling task run after the switch.
+        await asyncio.sleep(0)
+        seen["switch"] = ray_stub.get_context()
+
+    async def sibling():
+        await asyncio.sleep(0)
+        seen["sibling"] = ray_stub.get_context()
+
+    async def main():
+        await asyncio.gather(switch(), sibling())
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
+    # A context switched to in one task is not seen by its sibling, nor by
+    # the thread running the event loop.
+    assert seen["switch"] is not default_cxt
+    assert seen["sibling"] is default_cxt
+    assert ray_stub.get_context() is default_cxt
+
+    # A new thread starts on the default context, whatever the context of the
+    # thread that started it.
+    old_cxt = ray_stub.set_context(_ClientContext())
+    try:
+        thread_cxt = []
+        thread = threading.Thread(
+            target=lambda: thread_cxt.append(ray_stub.get_context()))
+        thread.start()
+        thread.join()
+        assert thread_cxt == [default_cxt]
+        assert ray_stub.get_context() is not default_cxt
+    finally:
+        ray_stub.set_context(old_cxt)
+    assert ray_stub.get_context() is default_cxt
+
+
 if __name__ == "__main__":
     sys.exit(pytest.main(["-v", __file__]))
@@ -21,6 +21,12 @@ def test_grpc_client_credentials_are_passed_to_channel(monkeypatch):
         def subscribe(self, f):
             raise Stop(self.credentials)
 
+        def unsubscribe(self, f):
+            pass
+
+        def close(self):
+            pass
+
     def mock_secure_channel(conn_str,
                             credentials,
                             options=None,
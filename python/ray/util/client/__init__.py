@@ -1,13 +1,17 @@
-from typing import List, Tuple, Dict, Any, Optional
+from types import MethodType
+from typing import List, Tuple, Dict, Any, Optional, Set, TYPE_CHECKING
 from ray.job_config import JobConfig
 from ray._private.client_mode_hook import (_explicitly_disable_client_mode,
                                            _explicitly_enable_client_mode)
 import os
 import sys
 import logging
-import json
 import threading
-import grpc
+import weakref
+from contextvars import ContextVar
+
+if TYPE_CHECKING:
+    import grpc
 
 logger = logging.getLogger(__name__)
 
@@ -15,8 +19,26 @@ logger = logging.getLogger(__name__)
 # protocol that require upgrading the client version.
 CURRENT_PROTOCOL_VERSION = "2021-08-26"
 
+_LOCAL_MAJOR_MINOR = f"{sys.version_info[0]}.{sys.version_info[1]}"
+
+# (python_version, protocol_version) pairs reported by servers that passed
+# the version check without any mismatch.
+_compatible_versions: Set[Tuple[str, str]] = set()
+
+# Whether the serializer addons have been registered at the client side.
+_serializers_registered = False
+
 
 class _ClientContext:
+    __slots__ = ("api", "client_worker", "_server", "_connected_with_init",
+                 "_inside_client_test", "_api_methods", "_finalizer",
+                 "__weakref__")
+
+    # Attributes that can be queried without a connection. The client is not
+    # connected, thus Ray is not considered initialized.
+    _DISCONNECTED_CALLABLES = frozenset(
+        ["is_initialized", "_internal_kv_initialized"])
+
     def __init__(self):
         from ray.util.client.api import ClientAPI
         self.api = ClientAPI()
@@ -24,6 +46,10 @@ class _ClientContext:
         self._server = None
         self._connected_with_init = False
         self._inside_client_test = False
+        # Bound methods of the client API resolved while connected. They are
+        # only served while the connection is up, and dropped on disconnect.
+        self._api_methods: Dict[str, MethodType] = {}
+        self._finalizer: Optional[weakref.finalize] = None
 
     def connect(self,
                 conn_str: str,
@@ -34,7 +60,7 @@ class _ClientContext:
                 namespace: str = None,
                 *,
                 ignore_version: bool = False,
-                _credentials: Optional[grpc.ChannelCredentials] = None,
+                _credentials: Optional["grpc.ChannelCredentials"] = None,
                 ray_init_kwargs: Optional[Dict[str, Any]] = None
                 ) -> Dict[str, Any]:
         """Connect the Ray Client to a server.
@@ -66,7 +92,7 @@ class _ClientContext:
             job_config = job_config or JobConfig()
             job_config.set_ray_namespace(namespace)
         if job_config is not None:
-            runtime_env = json.loads(job_config.get_serialized_runtime_env())
+            runtime_env = job_config.get_parsed_runtime_env()
             if runtime_env.get("pip") or runtime_env.get("conda"):
                 logger.warning("The 'pip' or 'conda' field was specified in "
                                "the runtime env, so it may take some time to "
@@ -79,8 +105,13 @@ class _ClientContext:
                 metadata=metadata,
                 connection_retries=connection_retries)
             self.api.worker = self.client_worker
-            self.client_worker._server_init(job_config, ray_init_kwargs)
-            conn_info = self.client_worker.connection_info()
+            # Close the connection if this context is garbage collected
+            # without being disconnected, e.g. an allow_multiple client
+            # whose ClientContext was dropped.
+            self._finalizer = weakref.finalize(self, self.client_worker.close)
+            self._finalizer.atexit = False
+            conn_info = self.client_worker._server_init(
+                job_config, ray_init_kwargs)
             self._check_versions(conn_info, ignore_version)
             self._register_serializers()
             return conn_info
@@ -93,17 +124,28 @@ class _ClientContext:
 
         The server side should have already registered the serializers via
         regular worker's serialization_context mechanism.
+
+        The addons register into the process-wide cloudpickle dispatch
+        table, so this only needs to happen on the first connect.
         """
+        global _serializers_registered
+        if _serializers_registered:
+            return
         import ray.serialization_addons
         from ray.util.serialization import StandaloneSerializationContext
         ctx = StandaloneSerializationContext()
         ray.serialization_addons.apply(ctx)
+        _serializers_registered = True
 
     def _check_versions(self, conn_info: Dict[str, Any],
                         ignore_version: bool) -> None:
-        local_major_minor = f"{sys.version_info[0]}.{sys.version_info[1]}"
-        if not conn_info["python_version"].startswith(local_major_minor):
-            version_str = f"{local_major_minor}.{sys.version_info[2]}"
+        versions = (conn_info["python_version"], conn_info["protocol_version"])
+        if versions in _compatible_versions:
+            return
+        mismatch = False
+        if not conn_info["python_version"].startswith(_LOCAL_MAJOR_MINOR):
+            mismatch = True
+            version_str = f"{_LOCAL_MAJOR_MINOR}.{sys.version_info[2]}"
             msg = "Python minor versions differ between client and server:" + \
                   f" client is {version_str}," + \
                   f" server is {conn_info['python_version']}"
@@ -112,6 +154,7 @@ class _ClientContext:
             else:
                 raise RuntimeError(msg)
         if CURRENT_PROTOCOL_VERSION != conn_info["protocol_version"]:
+            mismatch = True
             msg = "Client Ray installation incompatible with server:" + \
                   f" client is {CURRENT_PROTOCOL_VERSION}," + \
                   f" server is {conn_info['protocol_version']}"
@@ -119,10 +162,16 @@ class _ClientContext:
                 logger.warning(msg)
             else:
                 raise RuntimeError(msg)
+        if not mismatch:
+            _compatible_versions.add(versions)
 
     def disconnect(self):
         """Disconnect the Ray Client.
         """
+        self._api_methods.clear()
+        if self._finalizer is not None:
+            self._finalizer.detach()
+            self._finalizer = None
         if self.client_worker is not None:
             self.client_worker.close()
         self.client_worker = None
@@ -142,15 +191,24 @@ class _ClientContext:
         return self.api.remote(*args, **kwargs)
 
     def __getattr__(self, key: str):
-        if self.is_connected():
-            return getattr(self.api, key)
-        elif key in ["is_initialized", "_internal_kv_initialized"]:
-            # Client is not connected, thus Ray is not considered initialized.
+        # Read the slots with object.__getattribute__ so that an unset slot
+        # (e.g. before __init__ ran) can't recurse back into __getattr__.
+        client_worker = object.__getattribute__(self, "client_worker")
+        if client_worker is not None and client_worker.is_connected():
+            return getattr(object.__getattribute__(self, "api"), key)
+        elif key in self._DISCONNECTED_CALLABLES:
             return lambda: False
         else:
             raise Exception("Ray Client is not connected. "
                             "Please connect by calling `ray.init`.")
 
+    def _resolve_api_attr(self, key: str):
+        """Look up a ray API attribute, memoizing client API methods."""
+        value = self.__getattr__(key)
+        if isinstance(value, MethodType) and value.__self__ is self.api:
+            self._api_methods[key] = value
+        return value
+
     def is_connected(self) -> bool:
         if self.client_worker is None:
             return False
@@ -177,13 +235,53 @@ class _ClientContext:
         self._server = None
 
 
-# All connected context will be put here
-# This struct will be guarded by a lock for thread safety
-_all_contexts = set()
-_lock = threading.Lock()
+# All connected context will be put here. Contexts are only weakly
+# referenced, so that ones the user dropped without disconnecting can be
+# collected (which closes their connection); their dead references are
+# pruned lazily. The references carry no callbacks and hash and compare via
+# the C-level object defaults, so single operations on this set (add,
+# discard, list, difference_update, len) are atomic under the GIL and no
+# explicit lock is needed. Iteration must go over a list() snapshot.
+_all_contexts: Set["weakref.ReferenceType[_ClientContext]"] = set()
+
+
+def _add_context(cxt: _ClientContext) -> None:
+    _all_contexts.add(weakref.ref(cxt))
+
+
+def _remove_context(cxt: _ClientContext) -> None:
+    _all_contexts.discard(weakref.ref(cxt))
 
-# This is the default context which is used when allow_multiple is not True
-_default_context = _ClientContext()
+
+def _take_all_contexts() -> List[_ClientContext]:
+    """Unregister all contexts, returning the ones still alive."""
+    refs = list(_all_contexts)
+    # Only drop the snapshotted references, so that a context registered
+    # concurrently by another thread is kept.
+    _all_contexts.difference_update(refs)
+    return [cxt for cxt in (ref() for ref in refs) if cxt is not None]
+
+
+# This is the default context which is used when allow_multiple is not True.
+# It is constructed lazily so that importing this module doesn't pay for
+# importing the client API.
+_default_context = None
+_default_context_lock = threading.Lock()
+
+
+def _get_default_context() -> _ClientContext:
+    global _default_context
+    if _default_context is None:
+        with _default_context_lock:
+            if _default_context is None:
+                _default_context = _ClientContext()
+    return _default_context
+
+
+# The context used by the current thread or asyncio task. Unset means the
+# default context.
+_current_context: "ContextVar[Optional[_ClientContext]]" = ContextVar(
+    "ray_client_context", default=None)
 
 
 class RayAPIStub:
@@ -195,79 +293,79 @@ class RayAPIStub:
     """
 
     def __init__(self):
-        self._cxt = threading.local()
-        self._cxt.handler = _default_context
         self._inside_client_test = False
 
     def get_context(self):
-        try:
-            return self._cxt.__getattribute__("handler")
-        except AttributeError:
-            self._cxt.handler = _default_context
-            return self._cxt.handler
+        cxt = _current_context.get()
+        if cxt is None:
+            cxt = _get_default_context()
+            _current_context.set(cxt)
+        return cxt
 
     def set_context(self, cxt):
         old_cxt = self.get_context()
         if cxt is None:
-            self._cxt.handler = _ClientContext()
-        else:
-            self._cxt.handler = cxt
+            cxt = _ClientContext()
+        _current_context.set(cxt)
         return old_cxt
 
     def is_default(self):
-        return self.get_context() == _default_context
+        return self.get_context() is _get_default_context()
 
     def connect(self, *args, **kw_args):
-        self.get_context()._inside_client_test = self._inside_client_test
-        conn = self.get_context().connect(*args, **kw_args)
-        global _lock, _all_contexts
-        with _lock:
-            _all_contexts.add(self._cxt.handler)
+        cxt = self.get_context()
+        cxt._inside_client_test = self._inside_client_test
+        conn = cxt.connect(*args, **kw_args)
+        _add_context(cxt)
         return conn
 
     def disconnect(self, *args, **kw_args):
-        global _lock, _all_contexts, _default_context
-        with _lock:
-            if _default_context == self.get_context():
-                for cxt in _all_contexts:
-                    cxt.disconnect(*args, **kw_args)
-                _all_contexts = set()
-            else:
-                self.get_context().disconnect(*args, **kw_args)
-            if self.get_context() in _all_contexts:
-                _all_contexts.remove(self.get_context())
-            if len(_all_contexts) == 0:
-                _explicitly_disable_client_mode()
+        cxt = self.get_context()
+        if cxt is _get_default_context():
+            # Unregister everything up front so the per-context RPCs below
+            # don't race with other callers inspecting the registry.
+            for victim in _take_all_contexts():
+                victim.disconnect(*args, **kw_args)
+        else:
+            cxt.disconnect(*args, **kw_args)
+            _remove_context(cxt)
+        if num_connected_contexts() == 0:
+            _explicitly_disable_client_mode()
 
     def remote(self, *args, **kwargs):
-        return self.get_context().remote(*args, **kwargs)
+        # Skip the _ClientContext.remote wrapper and go straight to the API.
+        return self.get_context().api.remote(*args, **kwargs)
 
     def __getattr__(self, name):
-        return self.get_context().__getattr__(name)
+        cxt = self.get_context()
+        value = cxt._api_methods.get(name)
+        if value is None or not cxt.is_connected():
+            # The full lookup also covers a connection that dropped without
+            # an explicit disconnect.
+            value = cxt._resolve_api_attr(name)
+        return value
 
     def is_connected(self, *args, **kwargs):
         return self.get_context().is_connected(*args, **kwargs)
 
     def init(self, *args, **kwargs):
-        ret = self.get_context().init(*args, **kwargs)
-        global _lock, _all_contexts
-        with _lock:
-            _all_contexts.add(self._cxt.handler)
+        cxt = self.get_context()
+        ret = cxt.init(*args, **kwargs)
+        _add_context(cxt)
         return ret
 
     def shutdown(self, *args, **kwargs):
-        global _lock, _all_contexts
-        with _lock:
-            if _default_context == self.get_context():
-                for cxt in _all_contexts:
-                    cxt.shutdown(*args, **kwargs)
-                _all_contexts = set()
-            else:
-                self.get_context().shutdown(*args, **kwargs)
-            if self.get_context() in _all_contexts:
-                _all_contexts.remove(self.get_context())
-            if len(_all_contexts) == 0:
-                _explicitly_disable_client_mode()
+        cxt = self.get_context()
+        if cxt is _get_default_context():
+            # Unregister everything up front so the per-context RPCs below
+            # don't race with other callers inspecting the registry.
+            for victim in _take_all_contexts():
+                victim.shutdown(*args, **kwargs)
+        else:
+            cxt.shutdown(*args, **kwargs)
+            _remove_context(cxt)
+        if num_connected_contexts() == 0:
+            _explicitly_disable_client_mode()
 
 
 ray = RayAPIStub()
@@ -275,9 +373,9 @@ ray = RayAPIStub()
 
 def num_connected_contexts():
     """Return the number of client connections active."""
-    global _lock, _all_contexts
-    with _lock:
-        return len(_all_contexts)
+    _all_contexts.difference_update(
+        [ref for ref in list(_all_contexts) if ref() is None])
+    return len(_all_contexts)
 
 
 # Someday we might add methods in this module so that someone who
@@ -41,6 +41,13 @@ def fill_queue(
         output_queue.put(None)
 
 
+def _get_dashboard_url() -> str:
+    with disable_client_hook():
+        if not ray.is_initialized():
+            return ""
+        return ray.worker.get_dashboard_url() or ""
+
+
 class DataServicer(ray_client_pb2_grpc.RayletDataStreamerServicer):
     def __init__(self, basic_service: "RayletServicer"):
         self.basic_service = basic_service
@@ -80,6 +87,9 @@ class DataServicer(ray_client_pb2_grpc.RayletDataStreamerServicer):
                 req_type = req.WhichOneof("type")
                 if req_type == "init":
                     resp_init = self.basic_service.Init(req.init)
+                    if resp_init.ok:
+                        resp_init.connection_info.CopyFrom(
+                            self._build_connection_response())
                     resp = ray_client_pb2.DataResponse(init=resp_init, )
                 elif req_type == "get":
                     if req.get.asynchronous:
@@ -177,4 +187,5 @@ class DataServicer(ray_client_pb2_grpc.RayletDataStreamerServicer):
                 sys.version_info[0], sys.version_info[1], sys.version_info[2]),
             ray_version=ray.__version__,
             ray_commit=ray.__commit__,
-            protocol_version=CURRENT_PROTOCOL_VERSION)
+            protocol_version=CURRENT_PROTOCOL_VERSION,
+            dashboard_url=_get_dashboard_url())
@@ -560,15 +560,23 @@ class DataServicerProxy(ray_client_pb2_grpc.RayletDataStreamerServicer):
                                     ) -> ray_client_pb2.DataResponse:
         """
         Modify the `num_clients` returned the ConnectionInfoResponse because
-        individual SpecificServers only have **one** client.
+        individual SpecificServers only have **one** client. This also covers
+        the connection info attached to InitResponse.
         """
         init_type = init_resp.WhichOneof("type")
-        if init_type != "connection_info":
+        if init_type == "connection_info":
+            modified_resp = ray_client_pb2.DataResponse()
+            modified_resp.CopyFrom(init_resp)
+            connection_info = modified_resp.connection_info
+        elif init_type == "init" and init_resp.init.HasField(
+                "connection_info"):
+            modified_resp = ray_client_pb2.DataResponse()
+            modified_resp.CopyFrom(init_resp)
+            connection_info = modified_resp.init.connection_info
+        else:
             return init_resp
-        modified_resp = ray_client_pb2.DataResponse()
-        modified_resp.CopyFrom(init_resp)
         with self.clients_lock:
-            modified_resp.connection_info.num_clients = self.num_clients
+            connection_info.num_clients = self.num_clients
         return modified_resp
 
     def Datapath(self, request_iterator, context):
@@ -5,6 +5,7 @@ to the server.
 import base64
 import json
 import logging
+import threading
 import time
 import uuid
 import warnings
@@ -61,6 +62,47 @@ DESIGN_PATTERN_FINE_GRAIN_TASKS_LINK = \
 DESIGN_PATTERN_LARGE_OBJECTS_LINK = \
     "https://docs.google.com/document/d/167rnnDFIVRhHhK4mznEIemOtj63IOhtIPvSYaPgI4Fg/edit#heading=h.1afmymq455wu" # noqa E501
 
+# gRPC channels shared between workers that connect with identical channel
+# parameters, keyed by (conn_str, secure, credentials). Each entry holds the
+# channel and the number of workers currently using it. Client ids and other
+# metadata are sent per call, so they don't need to be part of the key.
+_channel_cache: Dict[tuple, List[Any]] = {}
+_channel_cache_lock = threading.Lock()
+
+
+def _acquire_channel(conn_str: str, secure: bool,
+                     credentials: Optional[grpc.ChannelCredentials]
+                     ) -> Tuple[tuple, grpc.Channel]:
+    """Return a channel for the given parameters, creating it if needed."""
+    key = (conn_str, secure, credentials)
+    with _channel_cache_lock:
+        entry = _channel_cache.get(key)
+        if entry is None:
+            if secure and credentials is None:
+                credentials = grpc.ssl_channel_credentials()
+            if credentials is not None:
+                channel = grpc.secure_channel(
+                    conn_str, credentials, options=GRPC_OPTIONS)
+            else:
+                channel = grpc.insecure_channel(conn_str, options=GRPC_OPTIONS)
+            entry = [channel, 0]
+            _channel_cache[key] = entry
+        entry[1] += 1
+        return key, entry[0]
+
+
+def _release_channel(key: tuple) -> None:
+    """Drop a reference to a cached channel, closing it when unused."""
+    with _channel_cache_lock:
+        entry = _channel_cache.get(key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+        del _channel_cache[key]
+    entry[0].close()
+
 
 def backoff(timeout: int) -> int:
     timeout = timeout + 5
@@ -99,16 +141,27 @@ class Worker:
         self._conn_state = grpc.ChannelConnectivity.IDLE
         self._converted: Dict[str, ClientStub] = {}
 
-        if secure and _credentials is None:
-            _credentials = grpc.ssl_channel_credentials()
+        # Workers connecting with the same parameters share one channel, and
+        # thus one HTTP/2 connection to the server.
+        self._channel_key, self.channel = _acquire_channel(
+            conn_str, secure, _credentials)
 
-        if _credentials is not None:
-            self.channel = grpc.secure_channel(
-                conn_str, _credentials, options=GRPC_OPTIONS)
-        else:
-            self.channel = grpc.insecure_channel(
-                conn_str, options=GRPC_OPTIONS)
+        try:
+            self._connect_channel(connection_retries)
+        except BaseException:
+            # Don't hold on to the shared channel if we failed to connect.
+            self._close_channel()
+            raise
+
+        self.closed = False
 
+        # Track these values to raise a warning if many tasks are being
+        # scheduled
+        self.total_num_tasks_scheduled = 0
+        self.total_outbound_message_size_bytes = 0
+
+    def _connect_channel(self, connection_retries: int) -> None:
+        """Waits for the server to respond and opens the data/log streams."""
         self.channel.subscribe(self._on_channel_state_change)
 
         # Retry the connection until the channel responds to something
@@ -168,13 +221,6 @@ class Worker:
         self.log_client = LogstreamClient(self.channel, self.metadata)
         self.log_client.set_logstream_level(logging.INFO)
 
-        self.closed = False
-
-        # Track these values to raise a warning if many tasks are being
-        # scheduled
-        self.total_num_tasks_scheduled = 0
-        self.total_outbound_message_size_bytes = 0
-
     def _on_channel_state_change(self, conn_state: grpc.ChannelConnectivity):
         logger.debug(f"client gRPC channel state change: {conn_state}")
         self._conn_state = conn_state
@@ -184,13 +230,7 @@ class Worker:
             data = self.data_client.ConnectionInfo()
         except grpc.RpcError as e:
             raise decode_exception(e)
-        return {
-            "num_clients": data.num_clients,
-            "python_version": data.python_version,
-            "ray_version": data.ray_version,
-            "ray_commit": data.ray_commit,
-            "protocol_version": data.protocol_version,
-        }
+        return _connection_info_to_dict(data)
 
     def register_callback(
             self, ref: ClientObjectRef,
@@ -398,12 +438,16 @@ class Worker:
     def close(self):
         self.data_client.close()
         self.log_client.close()
-        if self.channel:
-            self.channel.close()
-            self.channel = None
+        self._close_channel()
         self.server = None
         self.closed = True
 
+    def _close_channel(self):
+        if self.channel:
+            self.channel.unsubscribe(self._on_channel_state_change)
+            _release_channel(self._channel_key)
+            self.channel = None
+
     def get_actor(self, name: str,
                   namespace: Optional[str] = None) -> ClientActorHandle:
         task = ray_client_pb2.ClientTask()
@@ -513,8 +557,9 @@ class Worker:
 
     def _server_init(self,
                      job_config: JobConfig,
-                     ray_init_kwargs: Optional[Dict[str, Any]] = None):
-        """Initialize the server"""
+                     ray_init_kwargs: Optional[Dict[str, Any]] = None
+                     ) -> Dict[str, Any]:
+        """Initialize the server and return its connection info"""
         if ray_init_kwargs is None:
             ray_init_kwargs = {}
         try:
@@ -540,6 +585,10 @@ class Worker:
 
         except grpc.RpcError as e:
             raise decode_exception(e)
+        if response.HasField("connection_info"):
+            return _connection_info_to_dict(response.connection_info)
+        # Older servers don't attach the connection info to the response.
+        return self.connection_info()
 
     def _convert_actor(self, actor: "ActorClass") -> str:
         """Register a ClientActorClass for the ActorClass and return a UUID"""
@@ -587,6 +636,18 @@ class Worker:
         return key in self._converted
 
 
+def _connection_info_to_dict(
+        data: ray_client_pb2.ConnectionInfoResponse) -> Dict[str, Any]:
+    return {
+        "num_clients": data.num_clients,
+        "python_version": data.python_version,
+        "ray_version": data.ray_version,
+        "ray_commit": data.ray_commit,
+        "protocol_version": data.protocol_version,
+        "dashboard_url": data.dashboard_url,
+    }
+
+
 def make_client_id() -> str:
     id = uuid.uuid4()
     return id.hex
@@ -3,9 +3,10 @@ from ray.job_config import JobConfig
 from ray._private.client_mode_hook import _set_client_hook_status
 from ray._private.client_mode_hook import _explicitly_enable_client_mode
 
-from typing import List, Tuple, Dict, Any, Optional
+from typing import List, Tuple, Dict, Any, Optional, TYPE_CHECKING
 
-import grpc
+if TYPE_CHECKING:
+    import grpc
 
 
 def connect(
@@ -17,7 +18,7 @@ def connect(
         namespace: str = None,
         *,
         ignore_version: bool = False,
-        _credentials: Optional[grpc.ChannelCredentials] = None,
+        _credentials: Optional["grpc.ChannelCredentials"] = None,
         ray_init_kwargs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     if ray.is_connected():
         raise RuntimeError("Ray Client is already connected. Maybe you called "
@@ -226,6 +226,7 @@ if setup_spec.type == SetupType.RAY:
     setup_spec.install_requires = [
         "attrs",
         "click >= 7.0",
+        "contextvars; python_version < '3.7'",
         "dataclasses; python_version < '3.7'",
         "filelock",
         "grpcio >= 1.28.1",